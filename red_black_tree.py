@@ -1,21 +1,33 @@
+import sys
 from collections import deque
 
 class RBNode:
-    ''' The node for a red-black tree. A color of 0 is red, a color of 1 is black.'''
+    ''' The node for a red-black tree. A color of 0 is red, a color of 1 is black. A side of 0
+    means the node is the left child of its parent, a side of 1 means it is the right child.
 
-    def __init__(self, data, parent = None, left = None, right = None):
+    Nodes only have the attributes listed in __slots__, setting any other attribute on a node
+    raises AttributeError.'''
+
+    # Fixed attribute layout, nodes carry no per-instance __dict__
+    __slots__ = ('data', 'color', 'parent', 'left', 'right', 'side')
+
+    def __init__(self, data, parent = None, left = None, right = None, side = 0):
         self.data = data
         self.color = 0
         self.parent = parent
         self.left = left
         self.right = right
+        self.side = side
 
 class RedBlackTree:
 
-    # Sets the root of the tree to none
-    def __init__(self):
+    # Sets the root of the tree to none. If auto_compact_every is set, the tree calls compact()
+    #   after that many insertions and deletions.
+    def __init__(self, auto_compact_every = 0):
         self.root = None
         self.black_height = 0
+        self.auto_compact_every = auto_compact_every
+        self.modifications = 0
 
     # Inserts a new node into the tree exactly like a binary search tree, then calls
     #   balance(RBNode) method to handle any necessary re-balancing
@@ -26,209 +38,248 @@ class RedBlackTree:
             new_node.color = 1
             self.root = new_node
             self.black_height += 1
+            self.count_modification()
             return
         
         current = self.root
-        # This loop finds the leaf node to be replaced with the new value and inserts
-        #   the new node at that location. It escapes after adding the node and reaching
-        #   one of 2 break statements
+        # This loop finds the empty child where the new value belongs, it checks for the end
+        #   of the path once per level
         while True:
-            # New value is less than the value of the current node
+            # New values less than the value of the current node go left, greater than or
+            #   equal go right
             if data < current.data:
-                # Check if the left subtree is not empty
-                if current.left is not None:
-                    # Continue the search in the left sub tree 
-                    current = current.left
-                else:
-                    # Add the new value at this location
-                    current.left = RBNode(data, current)
-                    current = current.left
-                    break
-            # New value is greater than or equal to the value of the current node
+                side = 0
+                child = current.left
             else:
-                # Check if the right subtree is not empty
-                if current.right is not None:
-                    # Continue the search in the right sub tree
-                    current = current.right
-                else:
-                    # Add the new value at this location
-                    current.right = RBNode(data, current)
-                    current = current.right
-                    break
+                side = 1
+                child = current.right
+            # Stop at an empty sub tree, otherwise continue the search in the sub tree
+            if child is None:
+                break
+            current = child
 
-        # Newly added nodes are red, so now we check if the newly added node has a red
-        #   parent and therefor breaks the no red-red parent-child rule
-        if current.parent.color == 0:
-            self.insert_rebalance(current)
+        # Add the new value at this location
+        new_node = RBNode(data, current, side = side)
+        if side == 0:
+            current.left = new_node
+        else:
+            current.right = new_node
 
-    # This method re-balances the tree based on red-black tree rules, it is called
-    #   after insertions and may recursively call itself in some circumstances
-    def insert_rebalance(self, current):
-        # Get the parent and grandparent of the current node. Note that the root node is always 
-        #   black so if the no red-red parent-child rule is broken, then the parent is never
-        #   the root node and the existence of a grandparent is guarenteed.
-        parent = current.parent
-        grandparent = parent.parent
+        # Newly added nodes are red, so now we check if the newly added node has a red
+        #   parent and therefor breaks the no red-red parent-child rule. The parent is the
+        #   last node visited by the loop above.
+        if current.color == 0:
+            self.insert_rebalance(new_node, current, current.parent)
+        self.count_modification()
 
-        # Get the uncle of the current node
-        if grandparent.left == parent:
-            uncle = grandparent.right
-        else:
-            uncle = grandparent.left
+    # Inserts every value in an iterable. An empty tree is built directly from the sorted values, the
+    #   middle value of each range becomes the parent of the two halves and nodes are created level by
+    #   level so neighbouring nodes are allocated together. Nodes on the deepest level are red and all
+    #   others are black, which satisfies the red-black rules without any re-balancing. A tree that
+    #   already has nodes inserts the values one at a time.
+    def insert_many(self, data):
+        if self.root is not None:
+            for value in data:
+                self.insert(value)
+            return
 
-        # Check the color of the current node's uncle
-        if uncle is not None and uncle.color == 0:
-            # Uncle is red, this is insertion case 1. Set the parent and uncle of the current
-            #   node to black and the grandparent to red.
-            parent.color, uncle.color, grandparent.color = 1, 1, 0
+        data = sorted(data)
+        if not data:
+            return
+        # Choosing the middle value leaves every empty child on the deepest level or the one above it
+        max_depth = len(data).bit_length() - 1
+        # Each queue entry is a range of sorted values to form a sub tree, its parent, which side of
+        #   the parent it goes on, and its depth
+        ranges = deque()
+        ranges.append((0, len(data) - 1, None, 0, 0))
+        while ranges:
+            low, high, parent, side, depth = ranges.popleft()
+            middle = (low + high) // 2
+            new_node = RBNode(data[middle], parent, side = side)
+            # Only the deepest level is red, the root stays black even when it is the only level
+            if depth < max_depth or depth == 0:
+                new_node.color = 1
+            # Link the new node to its parent
+            if parent is None:
+                self.root = new_node
+            elif side == 1:
+                parent.right = new_node
+            else:
+                parent.left = new_node
+            # Queue the values on either side of the middle value as the left and right sub trees
+            if low < middle:
+                ranges.append((low, middle - 1, new_node, 0, depth + 1))
+            if middle < high:
+                ranges.append((middle + 1, high, new_node, 1, depth + 1))
+        # Every level above the deepest is black
+        self.black_height = max(max_depth, 1)
 
-            # Check if the grandparent is the root node
-            if grandparent is self.root:
-                # Change the color back to black, increase the blackheight by 1. This is 
-                #   a terminal case because we've re-balanced all the way up the tree.
-                grandparent.color = 1
-                self.black_height += 1
-            # Check if great grandparent is the root node
-            elif grandparent.parent is self.root:
-                # This is a terminal case because we've re-balanced all the way up the tree.
-                return
+    # This method re-balances the tree based on red-black tree rules, it is called
+    #   after insertions and loops up the tree while a red-red conflict remains. The
+    #   caller passes in the parent and grandparent of the current node. Note that the root
+    #   node is always black so if the no red-red parent-child rule is broken, then the parent
+    #   is never the root node and the existence of a grandparent is guarenteed.
+    def insert_rebalance(self, current, parent, grandparent):
+        while True:
+            # Get the uncle of the current node
+            parent_is_left = parent.side == 0
+            if parent_is_left:
+                uncle = grandparent.right
             else:
-                # Continue up the tree re-balancing from the position of the grandparent if there is 
-                #   still a red-red parent-child conflict, otherwise this is a terminal case
-                if (grandparent.parent.color == 0):
-                    self.insert_rebalance(grandparent)
+                uncle = grandparent.left
+
+            # Check the color of the current node's uncle
+            if uncle is not None and uncle.color == 0:
+                # Uncle is red, this is insertion case 1. Set the parent and uncle of the current
+                #   node to black and the grandparent to red.
+                parent.color, uncle.color, grandparent.color = 1, 1, 0
 
-        else: # All paths below are terminal cases
-            # Uncle is black. Now we have to check if the current node is the 'inside child' 
-            #   of its parent. To find this we compare the relationship between grandparent
-            #   and parent to the relation between parent and current. If they are different
-            #   then the current node is an inside child. ex: parent is left child of grandparent
-            #   and current is right child of parent. If there is an inside child then it is
-            #   case 2 and we perform a rotation to get an outside child. An outside child is case 3
-            if parent is grandparent.left and current is parent.right:
-                # Perform a left rotation on the child and parent to create an outside child. 
-                self.rotation(current)
-                # Swap current and parent name
-                current, parent = parent, current
+                # Check if the grandparent is the root node
+                if grandparent is self.root:
+                    # Change the color back to black, increase the blackheight by 1. This is 
+                    #   a terminal case because we've re-balanced all the way up the tree.
+                    grandparent.color = 1
+                    self.black_height += 1
+                    return
+                # Check if great grandparent is the root node
+                elif grandparent.parent is self.root:
+                    # This is a terminal case because we've re-balanced all the way up the tree.
+                    return
+                else:
+                    # Continue up the tree re-balancing from the position of the grandparent if there is 
+                    #   still a red-red parent-child conflict, otherwise this is a terminal case
+                    if grandparent.parent.color == 0:
+                        current = grandparent
+                        parent = current.parent
+                        grandparent = parent.parent
+                        continue
+                    return
 
-            # This is the other inside child condition
-            elif parent is grandparent.right and current is parent.left:
-                # Perform a right rotation on the child and parent to create an outside child.
-                self.rotation(current)
-                # Swap current and parent name
-                current, parent = parent, current
+            else: # All paths below are terminal cases
+                # Uncle is black. Now we have to check if the current node is the 'inside child' 
+                #   of its parent. To find this we compare the relationship between grandparent
+                #   and parent to the relation between parent and current. If they are different
+                #   then the current node is an inside child. ex: parent is left child of grandparent
+                #   and current is right child of parent. If there is an inside child then it is
+                #   case 2 and we perform a rotation to get an outside child. An outside child is case 3
+                if parent_is_left and current.side == 1:
+                    # Perform a left rotation on the child and parent to create an outside child. 
+                    self.rotate_left(parent)
+                    # Swap current and parent name, grandparent is unchanged by this rotation
+                    current, parent = parent, current
 
-            # At this point we have an outside child and are in case 3. We perform a rotation
-            #   on the parent and grandparent, then we are finished re-balancing.
-            self.rotation(parent)
-            # Recolor parent and grandparent
-            grandparent.color = 0
-            parent.color = 1
+                # This is the other inside child condition
+                elif not parent_is_left and current.side == 0:
+                    # Perform a right rotation on the child and parent to create an outside child.
+                    self.rotate_right(parent)
+                    # Swap current and parent name, grandparent is unchanged by this rotation
+                    current, parent = parent, current
+
+                # At this point we have an outside child and are in case 3. We perform a rotation
+                #   on the parent and grandparent, then we are finished re-balancing.
+                if parent_is_left:
+                    self.rotate_right(grandparent)
+                else:
+                    self.rotate_left(grandparent)
+                # Recolor parent and grandparent
+                grandparent.color = 0
+                parent.color = 1
+                return
     
     # Searches calls search and delete_helper methods to delete a specific value, returns True
     #   on success or False if the value is not in the tree.
     def delete(self, data):
         # Search the tree for the value, return False if it does not exist in the tree
         current = self.search(data)
-        if current is False:
+        if current is None:
             return False
-        return self.delete_helper(current)
+        self.delete_helper(current)
+        self.count_modification()
+        return True
         
     # Deletes a specific node in the tree, returns True on success or False if the node is not 
-    #   in the tree. This method will recursively call itself when the node to be deleted has 2 children.
+    #   in the tree. This method will loop when the node to be deleted has 2 children.
     #   In such a case, this method will swap the node marked for deletion with its inorder successor,
-    #   Then attempt to delete the inorder successor which is guarenteed to have at most 1 child. A 
+    #   Then delete the inorder successor which is guarenteed to have at most 1 child. A 
     #   deleted black node with 1 child will force the tree to be rebalanced. A deleted red node or
     #   a deleted black node with no children does not cause the tree to be rebalanced.
     def delete_helper(self, current):
-        # Set the parent node
-        parent = current.parent
-        # Check how many children the node to be deleted has, first perform a deletion as a normal
-        #   Binary search tree, then recolor and rotate as necessary to repair red-black properties
-        if current.left is None:
-            if current.right is None:
-                # Node has no children, simply delete it
-                if parent is not None:
+        while True:
+            # Set the parent node
+            parent = current.parent
+            # Check how many children the node to be deleted has, first perform a deletion as a normal
+            #   Binary search tree, then recolor and rotate as necessary to repair red-black properties
+            if current.left is None:
+                if current.right is None:
+                    # Node has no children, simply delete it
+                    if parent is not None:
+                        # Rebalance if needed (if the node being deleted is black)
+                        if current.color == 1:
+                            self.delete_rebalance(current)
+                        # Finish deleting the node
+                        if current.side == 0:
+                            parent.left = None
+                        else:
+                            parent.right = None
+                        current.parent = None
+                    # Node to be deleted is the root node
+                    else:
+                        self.root = None
+                else: # Node has a right child only
                     # Rebalance if needed (if the node being deleted is black)
                     if current.color == 1:
                         self.delete_rebalance(current)
-                    # Finish deleting the node
-                    if parent.left == current:
-                        parent.left = None
+                    # Replace current with its right child
+                    if parent is not None:
+                        current.right.side = current.side
+                        if current.side == 0:
+                            parent.left = current.right
+                            parent.left.parent = parent
+                        else:
+                            parent.right = current.right
+                            parent.right.parent = parent
+                    # Node to be deleted is the root node        
                     else:
-                        parent.right = None
-                    current.parent = None
-                # Node to be deleted is the root node
-                else:
-                    self.root = None
-            else: # Node has a right child only
+                        self.root = current.right
+                        self.root.parent = None
+                    # Set current to the child that took its place, this is needed for rebalancing later
+                    current = current.right
+            elif current.right is None:  # Node has a left child only
                 # Rebalance if needed (if the node being deleted is black)
                 if current.color == 1:
                     self.delete_rebalance(current)
-                # Replace current with its right child
+                # Replace current with its left child
                 if parent is not None:
-                    if parent.left == current:
-                        parent.left = current.right
+                    current.left.side = current.side
+                    if current.side == 0:
+                        parent.left = current.left
                         parent.left.parent = parent
                     else:
-                        parent.right = current.right
+                        parent.right = current.left
                         parent.right.parent = parent
-                # Node to be deleted is the root node        
+                # Node to be deleted is the root node
                 else:
-                    self.root = current.right
+                    self.root = current.left
                     self.root.parent = None
                 # Set current to the child that took its place, this is needed for rebalancing later
-                current = current.right
-        elif current.right is None:  # Node has a left child only
-            # Rebalance if needed (if the node being deleted is black)
-            if current.color == 1:
-                self.delete_rebalance(current)
-            # Replace current with its left child
-            if parent is not None:
-                if parent.left == current:
-                    parent.left = current.left
-                    parent.left.parent = parent
-                else:
-                    parent.right = current.left
-                    parent.right.parent = parent
-            # Node to be deleted is the root node
-            else:
-                self.root = current.left
-                self.root.parent = None
-            # Set current to the child that took its place, this is needed for rebalancing later
-            current = current.left
-        else:
-            # Node has 2 children, replace the value in target node with its inorder predecessor or inorder 
-            #   successor, whichever is further down the tree. Then repeat this deletion from the location of 
-            #   the replaced predecessor or successor. Inorder predecessor is the rightmost node in the target's 
-            #   left sub tree and inorder successor is the leftmost node in the target's right sub tree
-            inorder_predecessor = current.left
-            inorder_predecessor_count = 0
-            inorder_successor = current.right
-            inorder_successor_count = 0
-            # Find the predecessor
-            while inorder_predecessor.right is not None:
-                inorder_predecessor = inorder_predecessor.right
-                inorder_predecessor_count += 1
-            # Find the successor
-            while inorder_successor.left is not None:
-                inorder_successor = inorder_successor.left
-                inorder_successor_count += 1
-            # Compare predecessor depth to successor depth, take the one that is deeper
-            if inorder_predecessor_count > inorder_successor_count:
-                # Swap the values in current and inorder predecessor
-                current.data, inorder_predecessor.data = inorder_predecessor.data, current.data
-                # Recursively call this function from the inorder node location
-                return self.delete_helper(inorder_predecessor)
+                current = current.left
             else:
+                # Node has 2 children, replace the value in target node with its inorder successor, then
+                #   repeat this deletion from the location of the replaced successor. Inorder successor is
+                #   the leftmost node in the target's right sub tree
+                inorder_successor = current.right
+                while inorder_successor.left is not None:
+                    inorder_successor = inorder_successor.left
                 # Swap the values in current and inorder successor
                 current.data, inorder_successor.data = inorder_successor.data, current.data
-                # Recursively call this function from the inorder node location
-                return self.delete_helper(inorder_successor)
-        # Node has been removed
-        return True
+                # Repeat the deletion from the inorder node location
+                current = inorder_successor
+                continue
+            # Node has been removed
+            return True
     
-    # Rebalances the tree to repair red-black tree properties after a deletion. When this method gets
+    # Rebalances the tree to repair red-black tree properties after a deletion, looping up the tree
+    #   while the case 2a recoloring pushes the problem towards the root. When this method gets
     #   control the node passed in is the only child of the previously deleted node, it has already 
     #   been raised up into the place of the deleted node.
     def delete_rebalance(self, current):
@@ -239,61 +290,65 @@ class RedBlackTree:
         if current.right is not None and current.right.color == 0:
             current.right.color = 1
             return True
-        # Current node is the root node, this is another trivial case
-        if current is self.root:
-            return True
-        else: # Current node is black and not the root node
-            # Set parent, sibling, and sibling-parent relationship (left or right child of parent)
+        # Move up the tree until the extra black is absorbed. The red child check above only applies to the
+        #   deleted node, on later passes the sibling has just been recolored red. Reaching the root node is
+        #   another trivial case
+        while current is not self.root: # Current node is black and not the root node
+            # Set parent, sibling, and whether sibling is the right child of parent
             parent = current.parent
-            if parent.left == current:
+            if current.side == 0:
                 sibling = parent.right
-                sibling_parent_relationship = 'right'
+                sibling_is_right = True
             else:
                 sibling = parent.left
-                sibling_parent_relationship = 'left'
+                sibling_is_right = False
             # Check if sibling of current node is red, this is case 1 and transforms into case 2b. 
             #   Current node of interest remains the same.
             if sibling.color == 0:
                 # Parent and sibling preform a rotation (left or right) depending on their relationship
-                self.rotation(sibling)
+                if sibling_is_right:
+                    self.rotate_left(parent)
+                else:
+                    self.rotate_right(parent)
                 # Parent and sibling recolor
                 parent.color = 0
                 sibling.color = 1
-                # Reset the sibling and parent sibling relationship, note that the new sibling must be 
+                # Reset the sibling and which child of parent it is, note that the new sibling must be 
                 #   black after the above transformation is complete
-                if parent.left == current:
+                if current.side == 0:
                     sibling = parent.right
-                    sibling_parent_relationship = 'right'
+                    sibling_is_right = True
                 else:
                     sibling = parent.left
-                    sibling_parent_relationship = 'left'
+                    sibling_is_right = False
             # The color of sibling is black, so now we check the color of sibling children starting
-            #   with checking if both are black, this is to maintain the simplest logic
-            if (sibling.left is None or sibling.left.color == 1) and (sibling.right is None or sibling.right.color == 1):
-                # Parent is black, sibling is black, and both children of sibling are black, 
-                #   this is case 2a. Recursively call this method in which parent becomes the new node 
-                #   of interest, recolor sibling to red, then return.
-                if parent.color == 1:
-                    success = self.delete_rebalance(parent)
-                    sibling.color = 0
-                    return success
-                # Parent is red and sibling is black, and both children of sibling are black, this 
-                #   is case 2b. This is a terminal case, recolor both parent and sibling, then return.
-                else:
-                    sibling.color = 0
+            #   with checking if both are black, this is to maintain the simplest logic. The children
+            #   are loaded once here and reused by every color check below.
+            left_nephew, right_nephew = sibling.left, sibling.right
+            left_nephew_black = left_nephew is None or left_nephew.color == 1
+            right_nephew_black = right_nephew is None or right_nephew.color == 1
+            if left_nephew_black and right_nephew_black:
+                # Sibling is black and both children of sibling are black, so recolor sibling to red
+                #   and move the extra black up to parent. If parent is red it absorbs the extra black 
+                #   by turning black, this is case 2b and a terminal case. Otherwise parent is black,
+                #   this is case 2a and parent becomes the new node of interest.
+                sibling.color = 0
+                if parent.color == 0:
                     parent.color = 1
                     return True
+                current = parent
+                continue
             # Now we look at cases where the children of sibling are not both black. For these cases
             #   parent may be either color. We start by examining the 'outside child'
-            if sibling_parent_relationship == 'right':
+            if sibling_is_right:
                 # Check if the outside child of sibling is black
-                if sibling.right is None or sibling.right.color == 1:
+                if right_nephew_black:
                     # Outside child is black and inside child is red (since we know both can't be black
                     #   if we made it to this point in the algorithm), this is case 3. This transforms 
                     #   into case 4, sibling and its left child perform a right rotation, then they 
                     #   each change color
-                    nephew = sibling.left
-                    self.rotation(nephew)
+                    nephew = left_nephew
+                    self.rotate_right(sibling)
                     # Update the colors of sibling and nephew
                     nephew.color = 1
                     sibling.color = 0
@@ -302,19 +357,19 @@ class RedBlackTree:
                 # Outside child is red and inside child may be either color, this is case 4. This is a
                 #   terminal case. Sibling and parent perform a left rotation. Sibling acquires the color
                 #   of parent, parent becomes black, and sibling's outside child becomes black.
-                self.rotation(sibling)
+                self.rotate_left(parent)
                 sibling.color = parent.color
                 parent.color = 1
                 sibling.right.color = 1
             else: # Sibling is the left child of parent and we need the mirror algorithms
                 # Check if the outside child of sibling is black
-                if sibling.left is None or sibling.left.color == 1:
+                if left_nephew_black:
                     # Outside child is black and inside child is red (since we know both can't be black
                     #   if we made it to this point in the algorithm), this is case 3. This transforms 
                     #   into case 4, sibling and its right child perform a left rotation, then they 
                     #   each change color
-                    nephew = sibling.right
-                    self.rotation(nephew)
+                    nephew = right_nephew
+                    self.rotate_left(sibling)
                     # Update the colors of sibling and nephew
                     nephew.color = 1
                     sibling.color = 0
@@ -323,132 +378,165 @@ class RedBlackTree:
                 # Outside child is red and inside child may be either color, this is case 4. This is a
                 #   terminal case. Sibling and parent perform a right rotation. Sibling acquires the color
                 #   of parent, parent becomes black, and sibling's outside child becomes black.
-                self.rotation(sibling)
+                self.rotate_right(parent)
                 sibling.color = parent.color
                 parent.color = 1
                 sibling.left.color = 1
+            return True
         return True
 
-    # This method rotates a node with its parent. The type of rotation (left or right) depends
-    #   on whether the node is the right or left child of its parent. A parent and left child
-    #   will be right rotated and vice versa.
-    def rotation(self, current):
-        parent = current.parent
-        # Check if the parent is None, this mean the current node is the root and we return without rotating
-        if parent is None:
-            return
-        # Check if parent's right child is the current node so we can perform the correct rotation.
-        if parent.right == current: # This is a left rotation
-            # Swap the middle sub tree from current to parent
-            parent.right = current.left
-            # Check if the middle sub tree has at least 1 node, update its parent if it does
-            if parent.right is not None:
-                parent.right.parent = parent
-            # Check if parent is the root node, if it is, make current the new root node
-            if self.root == parent:
-                self.root = current
-                current.parent = None
-            # Otherwise make current the new child of grandparent
-            else:
-                grandparent = parent.parent
-                # Update the correct child of grandparent
-                if grandparent.left == parent:
-                    grandparent.left = current
-                else:
-                    grandparent.right = current
-                # Update the parent of the current node
-                current.parent = grandparent
-            # Make parent the child of the current node and update parent's parent
-            current.left = parent
-            parent.parent = current
-        else: # This is a right rotation
-            # Swap the middle sub tree from current to parent
-            parent.left = current.right
-            # Check if the middle sub tree has at least 1 node, update its parent if it does
-            if parent.left is not None:
-                parent.left.parent = parent
-                current.parent = None
-            # Check if parent is the root node, if it is, make current the new root node
-            if self.root == parent:
-                self.root = current
-                current.parent = None
-            # Otherwise make current the new child of grandparent
-            else:
-                grandparent = parent.parent
-                # Update the correct child of grandparent
-                if grandparent.left == parent:
-                    grandparent.left = current
-                else:
-                    grandparent.right = current
-                # Update the parent of the current node
-                current.parent = grandparent
-            # Make parent the child of the current node and update parent's parent
-            current.right = parent
-            parent.parent = current
+    # Performs a left rotation about the parent node, its right child takes its place and the
+    #   parent becomes that child's left child.
+    def rotate_left(self, parent):
+        current = parent.right
+        # Swap the middle sub tree from current to parent
+        parent.right = current.left
+        # Check if the middle sub tree has at least 1 node, update its parent if it does
+        if parent.right is not None:
+            parent.right.parent = parent
+            parent.right.side = 1
+        # Check if parent is the root node, if it is, make current the new root node
+        grandparent = parent.parent
+        if grandparent is None:
+            self.root = current
+        # Otherwise make current the new child of grandparent
+        elif parent.side == 0:
+            grandparent.left = current
+        else:
+            grandparent.right = current
+        # Update the parent of the current node, it takes the side parent was on
+        current.parent = grandparent
+        current.side = parent.side
+        # Make parent the child of the current node and update parent's parent
+        current.left = parent
+        parent.parent = current
+        parent.side = 0
+
+    # Performs a right rotation about the parent node, its left child takes its place and the
+    #   parent becomes that child's right child.
+    def rotate_right(self, parent):
+        current = parent.left
+        # Swap the middle sub tree from current to parent
+        parent.left = current.right
+        # Check if the middle sub tree has at least 1 node, update its parent if it does
+        if parent.left is not None:
+            parent.left.parent = parent
+            parent.left.side = 0
+        # Check if parent is the root node, if it is, make current the new root node
+        grandparent = parent.parent
+        if grandparent is None:
+            self.root = current
+        # Otherwise make current the new child of grandparent
+        elif parent.side == 0:
+            grandparent.left = current
+        else:
+            grandparent.right = current
+        # Update the parent of the current node, it takes the side parent was on
+        current.parent = grandparent
+        current.side = parent.side
+        # Make parent the child of the current node and update parent's parent
+        current.right = parent
+        parent.parent = current
+        parent.side = 1
     
     # Searches the red-black tree for a given value and returns the node with the value
-    #   or returns False if the value is not in the tree.
+    #   or returns None if the value is not in the tree.
     def search(self, data):
         current = self.root
         # While loop travels the tree until it finds the value or reaches a leaf node
         while current is not None:
+            # Load the data in the current node once for both comparisons
+            node_data = current.data
             # Check if the data in the current node is what we are searching for
-            if data == current.data:
+            if data == node_data:
                 return current
             # Compare the data we are searching for to the data in the current node
-            elif data < current.data:
+            elif data < node_data:
                 current = current.left
             else:
                 current = current.right
         # The value is not in the tree
-        return False
+        return None
 
-    # Calls a helper method to print the left sub tree, then prints the root, then 
-    #   calls the helper method again to print the right sub tree.
-    def inorder_traverse(self):
-        if self.root is not None:
-            self.inorder_traverse_helper(self.root.left, 1)
-            # print(self.root.data)
-            print(str(self.root.data) + ', ' + str(self.root.color) + ', ' + '0')
-            self.inorder_traverse_helper(self.root.right, 1)
+    # Counts an insertion or deletion and compacts the tree once auto_compact_every of them have
+    #   happened since the last compaction. Does nothing when auto compaction is off.
+    def count_modification(self):
+        if self.auto_compact_every:
+            self.modifications += 1
+            if self.modifications >= self.auto_compact_every:
+                self.compact()
 
-    # Recursive helper method that prints out the entire tree except the root
-    def inorder_traverse_helper(self, current, depth):
-        if current is not None:
-            self.inorder_traverse_helper(current.left, depth + 1)
-            # print(current.data)
-            print(str(current.data) + ', ' + str(current.color) + ', ' + str(depth))
-            self.inorder_traverse_helper(current.right, depth + 1)
+    # Rebuilds every node of the tree in breadth first order, keeping the same shape and colors. After
+    #   many insertions and deletions, nodes that are near each other in the tree can be scattered in
+    #   memory. Allocating them again level by level puts the top of the tree, which every search
+    #   passes through, close together. Nodes returned by search before compacting are no longer part
+    #   of the tree.
+    def compact(self):
+        self.modifications = 0
+        if self.root is None:
+            return
+        new_root = RBNode(self.root.data)
+        new_root.color = self.root.color
+        # Each queue entry pairs a node of the old tree with its copy in the new tree
+        nodes = deque()
+        nodes.append((self.root, new_root))
+        while nodes:
+            current, new_node = nodes.popleft()
+            # Copy the children of the current node and queue them up
+            if current.left is not None:
+                new_node.left = RBNode(current.left.data, new_node, side = 0)
+                new_node.left.color = current.left.color
+                nodes.append((current.left, new_node.left))
+            if current.right is not None:
+                new_node.right = RBNode(current.right.data, new_node, side = 1)
+                new_node.right.color = current.right.color
+                nodes.append((current.right, new_node.right))
+        self.root = new_root
 
-    # Breadth first traverse of the tree
+    # Walks the tree in order with an explicit stack, collecting each node's data, color,
+    #   and depth, then prints the whole traversal with a single write.
+    def inorder_traverse(self):
+        stack = []
+        current = self.root
+        depth = 0
+        out = []
+        while current is not None or stack:
+            # Go as far left as possible, remembering each node and its depth on the way down
+            while current is not None:
+                stack.append((current, depth))
+                current = current.left
+                depth += 1
+            # Visit the node on top of the stack, then move into its right sub tree
+            current, depth = stack.pop()
+            out.append(str(current.data) + ', ' + str(current.color) + ', ' + str(depth))
+            current = current.right
+            depth += 1
+        if out:
+            sys.stdout.write('\n'.join(out) + '\n')
+
+    # Breadth first traverse of the tree, the output for every node is collected and printed with a single write
     def breadth_traverse(self):
-        # Initialize 2 synced deques, one for nodes and one for node depths
-        nodes = deque()
-        depths = deque()
-        nodes.append(self.root)
-        depths.append(0)
+        # Initialize a queue of nodes paired with their depths
+        nodes = deque([(self.root, 0)])
+        out = []
 
         # Loop will continue until the queue is empty
-        while len(nodes) > 0:
-            current = nodes.popleft()
-            depth = depths.popleft()
+        while nodes:
+            current, depth = nodes.popleft()
 
             # Check if the current node is not none
             if current is not None:
-                # Add the children of the current node and their depths to the queues
-                nodes.append(current.left)
-                nodes.append(current.right)
-                depths.append(depth + 1)
-                depths.append(depth + 1)
+                # Add the children of the current node and their depths to the queue
+                nodes.append((current.left, depth + 1))
+                nodes.append((current.right, depth + 1))
+                out.append('(' + str(current.data) + ', ' + str(current.color) + ', ' + str(depth) + ')')
+            else:
+                # Add None at leaf nodes
+                out.append('None')
 
-                # Print out the current node as well as its color and depth
-                if depths and depths[0] == depth:
-                    print('(' + str(current.data) + ', ' + str(current.color) + ', ' + str(depth) + ')', end = ' , ')
-                else:
-                    print('(' + str(current.data) + ', ' + str(current.color) + ', ' + str(depth) + ')')
+            # Separate nodes on the same depth, otherwise end the line
+            if nodes and nodes[0][1] == depth:
+                out.append(' , ')
             else:
-                # Print out None at leaf nodes
-                if depths and depths[0] == depth:
-                    print('None', end = ' , ')
-                else:
-                    print('None')
+                out.append('\n')
+        sys.stdout.write(''.join(out))